@@ -10,49 +10,88 @@ Data is stored persistently in ~/.config/Shift-Prompter/
 
 import os
 import sys
+import copy
 import time
 import json
 import signal
-import subprocess
+import shutil
+import hashlib
 from pathlib import Path
-from pynput import keyboard
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QPushButton,
     QMessageBox, QLineEdit, QDialog,
     QDialogButtonBox, QFormLayout, QTreeWidget, QTreeWidgetItem,
     QInputDialog, QComboBox, QHBoxLayout, QAbstractItemView,
-    QLabel, QSizePolicy, QPlainTextEdit, QTreeWidgetItemIterator, QStackedLayout, QStyle
+    QPlainTextEdit, QStackedLayout, QStyle,
+    QStyledItemDelegate, QStyleOptionViewItem
 )
-from PyQt6.QtCore import Qt, QEvent, QObject, pyqtSignal, QPoint, QRect
-from PyQt6.QtGui import QCursor, QGuiApplication, QIcon
+from PyQt6.QtCore import Qt, QEvent, QObject, QTimer, QThread, QRunnable, QThreadPool, pyqtSignal, QPoint, QRect
+from PyQt6.QtGui import QCursor, QGuiApplication, QIcon, QKeySequence, QShortcut
+
+# orjson serializes/parses in C and is markedly faster than stdlib json;
+# it's optional, so fall back to json with equivalent (bytes in/out) helpers.
+try:
+    import orjson
+
+    def _json_loads(data): return orjson.loads(data)
+    def _json_dumps(obj): return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _json_loads(data): return json.loads(data)
+    def _json_dumps(obj): return json.dumps(obj, indent=4, ensure_ascii=False).encode("utf-8")
 
 # --- Application Configuration ---
 CONFIG_DIR = Path.home() / ".config" / "Shift-Prompter"
 PROMPTS_FILE = CONFIG_DIR / "prompts.json"
 DOUBLE_TAP_THRESHOLD_S = 0.4
+DOUBLE_TAP_MIN_S = 0.06  # below this it's key bounce/auto-repeat, not a deliberate tap
+TOGGLE_THROTTLE_S = 0.5
+# Integer-nanosecond forms for the listener hot path: time.monotonic_ns
+# returns a plain int, avoiding a float allocation per keystroke.
+_DOUBLE_TAP_MIN_NS = int(DOUBLE_TAP_MIN_S * 1e9)
+_DOUBLE_TAP_MAX_NS = int(DOUBLE_TAP_THRESHOLD_S * 1e9)
+_TOGGLE_THROTTLE_NS = int(TOGGLE_THROTTLE_S * 1e9)
+SAVE_DEBOUNCE_MS = 300
 DATA_VERSION = 2
 
 class PromptDialog(QDialog):
     """A dialog window for adding and editing prompts with category support."""
+
+    # Named attributes get fixed slot storage instead of per-instance dict
+    # entries (the sip base still carries a __dict__, so this is additive).
+    __slots__ = ("name_input", "content_input", "select_widget", "category_combo",
+                 "create_widget", "new_category_input", "stacked_layout")
+
+    # Icon lookups hit the XDG theme cache / style engine, so resolve them once
+    # for all dialog instances (lazily, since they need a live QApplication).
+    _ADD_ICON = _APPLY_ICON = _CANCEL_ICON = None
+
+    @classmethod
+    def _icons(cls):
+        if cls._ADD_ICON is None:
+            style = QApplication.instance().style()
+            cls._ADD_ICON = QIcon.fromTheme("list-add")
+            cls._APPLY_ICON = style.standardIcon(QStyle.StandardPixmap.SP_DialogApplyButton)
+            cls._CANCEL_ICON = style.standardIcon(QStyle.StandardPixmap.SP_DialogCancelButton)
+        return cls._ADD_ICON, cls._APPLY_ICON, cls._CANCEL_ICON
+
     def __init__(self, parent=None, name="", content="", categories=None, current_category=""):
         super().__init__(parent)
         self.setWindowTitle("Manage Prompt")
         self.resize(600, 500)
 
-        self.name_input = QLineEdit(name)
-        
-        self.content_input = QPlainTextEdit(content)
+        self.name_input = QLineEdit()
+
+        self.content_input = QPlainTextEdit()
         self.content_input.setMinimumHeight(300)
         self.content_input.setLineWrapMode(QPlainTextEdit.LineWrapMode.WidgetWidth)
-        
+
         self.select_widget = QWidget()
         select_layout = QHBoxLayout(self.select_widget)
         select_layout.setContentsMargins(0, 0, 0, 0)
         self.category_combo = QComboBox()
-        if categories: self.category_combo.addItems(categories)
-        if current_category and current_category in categories: self.category_combo.setCurrentText(current_category)
-        
-        add_category_button = QPushButton(QIcon.fromTheme("list-add"), "")
+
+        add_icon, apply_icon, cancel_icon = self._icons()
+        add_category_button = QPushButton(add_icon, "")
         add_category_button.setFixedSize(28, 28); add_category_button.setToolTip("Add a new category")
         add_category_button.clicked.connect(self.show_add_category_ui)
         
@@ -65,11 +104,11 @@ class PromptDialog(QDialog):
         self.new_category_input = QLineEdit()
         self.new_category_input.setPlaceholderText("Enter new category name...")
         
-        save_button = QPushButton(self.style().standardIcon(QStyle.StandardPixmap.SP_DialogApplyButton), "")
+        save_button = QPushButton(apply_icon, "")
         save_button.setFixedSize(28, 28); save_button.setToolTip("Save")
         save_button.clicked.connect(self.save_new_category)
         
-        cancel_button = QPushButton(self.style().standardIcon(QStyle.StandardPixmap.SP_DialogCancelButton), "")
+        cancel_button = QPushButton(cancel_icon, "")
         cancel_button.setFixedSize(28, 28); cancel_button.setToolTip("Cancel")
         cancel_button.clicked.connect(self.show_select_category_ui)
         
@@ -90,6 +129,18 @@ class PromptDialog(QDialog):
         layout.addRow("Content:", self.content_input)
         layout.addWidget(buttons)
 
+        self.reset(name, content, categories, current_category)
+
+    def reset(self, name="", content="", categories=None, current_category=""):
+        """Repopulate the dialog's fields so one instance can be reused."""
+        self.name_input.setText(name)
+        self.content_input.setPlainText(content)
+        self.category_combo.clear()
+        if categories: self.category_combo.addItems(categories)
+        if current_category and current_category in (categories or ()): self.category_combo.setCurrentText(current_category)
+        self.show_select_category_ui()
+        self.name_input.setFocus()
+
     def show_add_category_ui(self):
         self.stacked_layout.setCurrentIndex(1); self.new_category_input.setFocus()
 
@@ -108,6 +159,8 @@ class PromptDialog(QDialog):
 
 class PromptTreeWidget(QTreeWidget):
     """Custom QTreeWidget to handle drag-and-drop and display custom item widgets."""
+    __slots__ = ("prompt_window",)
+
     def __init__(self, prompt_window):
         super().__init__()
         self.prompt_window = prompt_window
@@ -116,6 +169,11 @@ class PromptTreeWidget(QTreeWidget):
         self.setHeaderHidden(True)
         self.setColumnCount(1)
         self.setIndentation(15)
+        # All rows are single-line text, so let the view skip per-row sizing,
+        # expand animations and the double-click-to-expand hit test.
+        self.setUniformRowHeights(True)
+        self.setAnimated(False)
+        self.setExpandsOnDoubleClick(False)
 
     def dropEvent(self, event):
         target_item = self.itemAt(event.position().toPoint())
@@ -159,13 +217,125 @@ class PromptTreeWidget(QTreeWidget):
 
         event.ignore()
 
+class PromptItemDelegate(QStyledItemDelegate):
+    """Paints each row's label plus edit/delete action icons directly.
+
+    Replaces the per-row QWidget/QHBoxLayout/QPushButton trees previously
+    installed via setItemWidget: one delegate instance now serves every row,
+    so tree population allocates no widgets at all."""
+    __slots__ = ("_edit_icon", "_delete_icon")
+
+    ICON_SIZE = 16
+    ICON_PAD = 6
+
+    edit_requested = pyqtSignal(dict)
+    delete_requested = pyqtSignal(dict)
+
+    def __init__(self, tree_widget):
+        super().__init__(tree_widget)
+        self._edit_icon = QIcon.fromTheme("document-edit-symbolic", QIcon.fromTheme("document-edit"))
+        self._delete_icon = QIcon.fromTheme("edit-delete-symbolic", QIcon.fromTheme("user-trash"))
+
+    @staticmethod
+    def _has_actions(data):
+        # Every row gets action icons except the fixed Uncategorized header.
+        return data is not None and not (data["is_category"] and data["name"] == PromptWindow.UNCATEGORIZED_NAME)
+
+    def _icon_rects(self, rect):
+        y = rect.center().y() - self.ICON_SIZE // 2
+        delete_x = rect.right() - self.ICON_SIZE - self.ICON_PAD
+        edit_x = delete_x - self.ICON_SIZE - self.ICON_PAD
+        return (QRect(edit_x, y, self.ICON_SIZE, self.ICON_SIZE),
+                QRect(delete_x, y, self.ICON_SIZE, self.ICON_SIZE))
+
+    def paint(self, painter, option, index):
+        data = index.data(Qt.ItemDataRole.UserRole)
+        if self._has_actions(data):
+            # Reserve the icon strip so long labels elide instead of running
+            # underneath the icons.
+            reserved = QStyleOptionViewItem(option)
+            reserved.rect = option.rect.adjusted(0, 0, -2 * (self.ICON_SIZE + self.ICON_PAD), 0)
+            super().paint(painter, reserved, index)
+            edit_rect, delete_rect = self._icon_rects(option.rect)
+            self._edit_icon.paint(painter, edit_rect)
+            self._delete_icon.paint(painter, delete_rect)
+        else:
+            super().paint(painter, option, index)
+
+    def sizeHint(self, option, index):
+        hint = super().sizeHint(option, index)
+        hint.setHeight(max(hint.height(), self.ICON_SIZE + 8))
+        return hint
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton:
+            data = index.data(Qt.ItemDataRole.UserRole)
+            if self._has_actions(data):
+                pos = event.position().toPoint()
+                edit_rect, delete_rect = self._icon_rects(option.rect)
+                if edit_rect.contains(pos): self.edit_requested.emit(data); return True
+                if delete_rect.contains(pos): self.delete_requested.emit(data); return True
+        return super().editorEvent(event, model, option, index)
+
+class PromptWriter(QObject):
+    """Performs the prompts-file disk writes; lives on a dedicated worker
+    thread so the GUI thread never blocks on the filesystem."""
+    __slots__ = ()
+
+    error = pyqtSignal(str)
+    written = pyqtSignal()
+
+    def write(self, data):
+        try:
+            # Single-buffer write to a sibling temp file plus atomic rename, so
+            # a crash can never leave a truncated prompts.json behind.
+            tmp_file = PROMPTS_FILE.with_suffix(".json.tmp")
+            with open(tmp_file, "wb") as f: f.write(data)
+            os.replace(tmp_file, PROMPTS_FILE)
+            self.written.emit()
+        except OSError as e:
+            self.error.emit(f"Could not save prompts: {e}")
+
 class PromptWindow(QWidget):
     """The main application window that displays the list of prompts."""
+    __slots__ = ("app", "prompts_data", "_cat_index", "_prompt_index",
+                 "_cache_key", "_list_dirty", "_size_dirty", "_cached_height",
+                 "_row_height", "_chrome_height", "_last_hash", "_dialog",
+                 "_save_timer", "_writer", "_writer_thread",
+                 "main_layout", "button_layout", "tree_widget", "item_delegate")
+
     UNCATEGORIZED_NAME = "Uncategorized"
 
+    # Parsed-JSON cache shared by all instances, keyed by (path, st_mtime_ns, st_size)
+    # so an unchanged prompts file is never re-read or re-parsed.
+    _cache = {}
+
+    _write_requested = pyqtSignal(bytes)
+
     def __init__(self, app_controller):
         super().__init__()
         self.app = app_controller; self.prompts_data = {}
+        # Lookup tables over prompts_data: category name -> category dict and
+        # (category, prompt name) -> prompt dict, kept in step by the mutators
+        # so edit/delete/move/select never scan the lists.
+        self._cat_index = {}; self._prompt_index = {}
+        self._cache_key = None; self._list_dirty = True
+        self._size_dirty = True; self._cached_height = 0
+        self._row_height = None; self._chrome_height = None
+        self._last_hash = None
+        self._dialog = None
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(SAVE_DEBOUNCE_MS)
+        self._save_timer.timeout.connect(self._flush_save)
+        self._writer = PromptWriter()
+        self._writer_thread = QThread(self)
+        self._writer.moveToThread(self._writer_thread)
+        self._write_requested.connect(self._writer.write)
+        self._writer.written.connect(self._update_cache)
+        self._writer.error.connect(self._on_save_error)
+        self._writer_thread.start()
+        QApplication.instance().aboutToQuit.connect(self._shutdown)
         CONFIG_DIR.mkdir(parents=True, exist_ok=True)
         self.init_ui()
         self.load_prompts()
@@ -174,18 +344,20 @@ class PromptWindow(QWidget):
         self.setFixedWidth(320)
         self.setWindowTitle("Shift-Prompter")
         self.setWindowFlags(Qt.WindowType.WindowStaysOnTopHint | Qt.WindowType.FramelessWindowHint | Qt.WindowType.Tool)
-        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
         self.setObjectName("promptWindow")
         self.setStyleSheet("""
             #promptWindow { background-color: #495e80; border: 1px solid #000000; border-radius: 8px; }
             QPushButton { padding: 5px; }
-            QPushButton#ActionIcon { border: none; background: transparent; padding: 2px; }
         """)
 
         self.main_layout = QVBoxLayout(self)
         self.main_layout.setContentsMargins(10, 10, 10, 10) 
         
         self.tree_widget = PromptTreeWidget(self)
+        self.item_delegate = PromptItemDelegate(self.tree_widget)
+        self.item_delegate.edit_requested.connect(self.edit_item)
+        self.item_delegate.delete_requested.connect(self.delete_item)
+        self.tree_widget.setItemDelegate(self.item_delegate)
         self.tree_widget.itemDoubleClicked.connect(self.item_selected)
         self.tree_widget.itemExpanded.connect(lambda item: self.on_item_expansion_changed(item, True))
         self.tree_widget.itemCollapsed.connect(lambda item: self.on_item_expansion_changed(item, False))
@@ -201,263 +373,652 @@ class PromptWindow(QWidget):
         self.main_layout.addWidget(self.tree_widget)
         self.main_layout.addLayout(self.button_layout)
 
+        # Shortcuts instead of a keyPressEvent override: Qt matches these in
+        # its shortcut map rather than funnelling every key through Python.
+        QShortcut(QKeySequence(Qt.Key.Key_Escape), self, self.hide)
+        QShortcut(QKeySequence(Qt.Key.Key_Return), self.tree_widget, self._activate_current)
+        QShortcut(QKeySequence(Qt.Key.Key_Enter), self.tree_widget, self._activate_current)
+
     def event(self, event):
+        # Called for every event the window sees, so fetch the type once.
         if event.type() == QEvent.Type.WindowDeactivate: self.hide()
         return super().event(event)
 
+    def hideEvent(self, event):
+        # The window hiding marks the end of an editing burst, so force out
+        # any save still sitting in the debounce timer.
+        self._flush_pending()
+        super().hideEvent(event)
+
+    def closeEvent(self, event):
+        self._flush_pending()
+        super().closeEvent(event)
+
     def migrate_prompts_data(self, old_data):
         return {"version": DATA_VERSION, "categories": [], "uncategorized": old_data}
 
+    @staticmethod
+    def _stat_key():
+        """Return a cache key identifying the current on-disk prompts file, or None."""
+        try:
+            st = os.stat(PROMPTS_FILE)
+            return (str(PROMPTS_FILE), st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def maybe_reload(self):
+        """Refresh state only when needed: reload if the file changed on disk,
+        rebuild the tree only if an add/edit/delete marked it dirty."""
+        key = self._stat_key()
+        if key != self._cache_key:
+            self.load_prompts()
+        elif self._list_dirty:
+            self.refresh_list()
+
     def load_prompts(self):
         try:
+            key = self._stat_key()
+            if key is not None and key in self._cache:
+                self.prompts_data = copy.deepcopy(self._cache[key])
+                self._cache_key = key
+                self._rebuild_index()
+                self.refresh_list()
+                return
+            # Track whether anything actually changed shape; in the common case
+            # (current-format file) the startup rewrite is skipped entirely.
             if PROMPTS_FILE.exists():
-                with open(PROMPTS_FILE, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    self.prompts_data = self.migrate_prompts_data(data) if isinstance(data, list) else data
+                data = _json_loads(PROMPTS_FILE.read_bytes())
+                migrated = isinstance(data, list)
+                self.prompts_data = self.migrate_prompts_data(data) if migrated else data
             else:
                 self.prompts_data = { "version": DATA_VERSION, "categories": [{"name": "Email", "prompts": [{"name": "Closing", "content": "Kind regards,\n\n"}], "expanded": True}], "uncategorized": [{"name": "Quick Question", "content": "Hi, I have a quick question: "}], "uncategorized_expanded": True }
-            
-            if "uncategorized" not in self.prompts_data: self.prompts_data["uncategorized"] = []
-            if "uncategorized_expanded" not in self.prompts_data: self.prompts_data["uncategorized_expanded"] = True
+                migrated = True
+
+            if "uncategorized" not in self.prompts_data: self.prompts_data["uncategorized"] = []; migrated = True
+            if "uncategorized_expanded" not in self.prompts_data: self.prompts_data["uncategorized_expanded"] = True; migrated = True
             for category in self.prompts_data.get("categories", []):
-                if "expanded" not in category: category["expanded"] = True
-            self.save_prompts(); self.refresh_list()
-        except (IOError, json.JSONDecodeError) as e: QMessageBox.warning(self, "Error", f"Could not load prompts: {e}")
+                if "expanded" not in category: category["expanded"] = True; migrated = True
+            self._rebuild_index()
+            if migrated:
+                self.save_prompts()
+            elif key is not None:
+                # Nothing to write, but prime the cache so maybe_reload treats
+                # the file as known-current.
+                type(self)._cache = {key: copy.deepcopy(self.prompts_data)}
+                self._cache_key = key
+            self.refresh_list()
+        # ValueError covers both json.JSONDecodeError and orjson.JSONDecodeError.
+        except (OSError, ValueError) as e: QMessageBox.warning(self, "Error", f"Could not load prompts: {e}")
 
     def save_prompts(self):
-        try:
-            with open(PROMPTS_FILE, "w", encoding="utf-8") as f: json.dump(self.prompts_data, f, indent=4, ensure_ascii=False)
-        except IOError as e: QMessageBox.warning(self, "Error", f"Could not save prompts: {e}")
-            
-    def _create_item_widget(self, name, item_data):
-        widget, layout = QWidget(), QHBoxLayout()
-        layout.setContentsMargins(4, 2, 4, 2)
-        label = QLabel(name)
-        label.setToolTip(name)
-        label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
-        layout.addWidget(label)
-        
-        if not (item_data["is_category"] and name == self.UNCATEGORIZED_NAME):
-            edit_button = QPushButton(QIcon.fromTheme("document-edit-symbolic", QIcon.fromTheme("document-edit")), "")
-            edit_button.setObjectName("ActionIcon"); edit_button.setFixedSize(22, 22); edit_button.setToolTip("Edit")
-            edit_button.clicked.connect(lambda: self.edit_item(item_data))
-            layout.addWidget(edit_button)
-            delete_button = QPushButton(QIcon.fromTheme("edit-delete-symbolic", QIcon.fromTheme("user-trash")), "")
-            delete_button.setObjectName("ActionIcon"); delete_button.setFixedSize(22, 22); delete_button.setToolTip("Delete")
-            delete_button.clicked.connect(lambda: self.delete_item(item_data))
-            layout.addWidget(delete_button)
-        widget.setLayout(layout)
-        return widget
+        """Schedule a write; bursts of edits are coalesced into one disk write."""
+        # Every data mutation comes through here, so it doubles as the
+        # invalidation point for the cached window height.
+        self._size_dirty = True
+        self._save_timer.start()
+
+    def _flush_pending(self):
+        """Force out a scheduled save immediately (e.g. when the window hides)."""
+        if self._save_timer.isActive():
+            self._save_timer.stop()
+            self._flush_save()
+
+    def _flush_save(self, direct=False):
+        data = _json_dumps(self.prompts_data)
+        data_hash = hashlib.blake2b(data, digest_size=16).digest()
+        if data_hash == self._last_hash: return
+        self._last_hash = data_hash
+        if direct:
+            # Shutdown path: the worker loop is gone, write on this thread.
+            self._writer.write(data)
+        else:
+            self._write_requested.emit(data)
 
+    def _on_save_error(self, msg):
+        self._last_hash = None  # let the next flush retry the write
+        QMessageBox.warning(self, "Error", msg)
+
+    def _shutdown(self):
+        """Drain the writer on quit, then write any remaining state in-line."""
+        self._save_timer.stop()
+        self._writer_thread.quit()
+        self._writer_thread.wait(2000)
+        self._last_hash = None  # a queued write may have been dropped; force one
+        self._flush_save(direct=True)
+
+    def _update_cache(self):
+        """Re-key the parsed-JSON cache after a write so reopening skips re-parsing."""
+        key = self._stat_key()
+        if key is not None:
+            type(self)._cache = {key: copy.deepcopy(self.prompts_data)}
+        self._cache_key = key
+            
     def refresh_list(self):
-        self.tree_widget.clear()
-        for category in self.prompts_data.get("categories", []): self.create_category_item(category)
-        
-        if self.prompts_data.get("uncategorized"):
-            unc_data = {"name": self.UNCATEGORIZED_NAME, "is_category": True}
-            unc_item = QTreeWidgetItem(self.tree_widget)
-            unc_item.setData(0, Qt.ItemDataRole.UserRole, unc_data)
-            unc_item.setFlags(unc_item.flags() & ~Qt.ItemFlag.ItemIsDragEnabled | Qt.ItemFlag.ItemIsDropEnabled)
-            self.tree_widget.setItemWidget(unc_item, 0, self._create_item_widget(self.UNCATEGORIZED_NAME, unc_data))
-            unc_item.setExpanded(self.prompts_data.get("uncategorized_expanded", True))
-            for prompt in self.prompts_data.get("uncategorized", []): self.create_prompt_item(prompt, self.UNCATEGORIZED_NAME, unc_item)
+        # Suspend painting for the duration of the rebuild so the clear and
+        # every insert coalesce into a single repaint. Signals are blocked too:
+        # the programmatic setExpanded calls would otherwise fire the expansion
+        # handler and schedule a pointless save on every populate.
+        self.tree_widget.setUpdatesEnabled(False)
+        self.tree_widget.blockSignals(True)
+        try:
+            self.tree_widget.clear()
+            # Build the whole forest detached and attach it with one call so the
+            # model sees a single insertion instead of one per item.
+            top_items = []; expand = []
+            for category in self.prompts_data.get("categories", []):
+                top_items.append(self._build_category_item(category))
+                expand.append(category.get("expanded", True))
+            unc_prompts = self.prompts_data.get("uncategorized")
+            if unc_prompts:
+                unc_item = self._build_uncategorized_item()
+                unc_item.addChildren([self._build_prompt_item(p, self.UNCATEGORIZED_NAME) for p in unc_prompts])
+                top_items.append(unc_item)
+                expand.append(self.prompts_data.get("uncategorized_expanded", True))
+            self.tree_widget.addTopLevelItems(top_items)
+            # setExpanded only sticks once the item belongs to a view.
+            for item, expanded in zip(top_items, expand): item.setExpanded(expanded)
+        finally:
+            self.tree_widget.blockSignals(False)
+            self.tree_widget.setUpdatesEnabled(True)
+        self._list_dirty = False; self._size_dirty = True
 
-    def create_category_item(self, cat_dict):
+    def _build_category_item(self, cat_dict):
+        """Build a detached category item with its prompt children attached."""
         cat_data = {"name": cat_dict["name"], "is_category": True}
-        cat_item = QTreeWidgetItem(self.tree_widget)
+        cat_item = QTreeWidgetItem()
         cat_item.setData(0, Qt.ItemDataRole.UserRole, cat_data)
         cat_item.setFlags(Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsDropEnabled | Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsDragEnabled)
-        self.tree_widget.setItemWidget(cat_item, 0, self._create_item_widget(cat_dict["name"], cat_data))
+        cat_item.setText(0, cat_dict["name"]); cat_item.setToolTip(0, cat_dict["name"])
+        cat_item.addChildren([self._build_prompt_item(p, cat_dict["name"]) for p in cat_dict.get("prompts", [])])
+        return cat_item
+
+    def create_category_item(self, cat_dict, index=None):
+        cat_item = self._build_category_item(cat_dict)
+        if index is None: self.tree_widget.addTopLevelItem(cat_item)
+        else: self.tree_widget.insertTopLevelItem(index, cat_item)
         cat_item.setExpanded(cat_dict.get("expanded", True))
-        for prompt in cat_dict.get("prompts", []): self.create_prompt_item(prompt, cat_dict["name"], cat_item)
+        return cat_item
 
-    def create_prompt_item(self, prompt_dict, cat_name, parent_item):
+    def _build_prompt_item(self, prompt_dict, cat_name):
+        # Only keys are stored here: setData copies dicts into QVariant maps,
+        # so a stashed prompt dict would go stale after an in-place edit.
+        # Selection resolves the live dict through _prompt_index instead.
         prompt_data = {"name": prompt_dict["name"], "category": cat_name, "is_category": False}
-        prompt_item = QTreeWidgetItem(parent_item)
+        prompt_item = QTreeWidgetItem()
         prompt_item.setData(0, Qt.ItemDataRole.UserRole, prompt_data)
         prompt_item.setFlags(prompt_item.flags() | Qt.ItemFlag.ItemIsDragEnabled)
-        self.tree_widget.setItemWidget(prompt_item, 0, self._create_item_widget(prompt_dict["name"], prompt_data))
+        prompt_item.setText(0, prompt_dict["name"]); prompt_item.setToolTip(0, prompt_dict["name"])
+        return prompt_item
+
+    def create_prompt_item(self, prompt_dict, cat_name, parent_item):
+        parent_item.addChild(self._build_prompt_item(prompt_dict, cat_name))
+
+    def _build_uncategorized_item(self):
+        unc_data = {"name": self.UNCATEGORIZED_NAME, "is_category": True}
+        unc_item = QTreeWidgetItem()
+        unc_item.setData(0, Qt.ItemDataRole.UserRole, unc_data)
+        unc_item.setFlags(unc_item.flags() & ~Qt.ItemFlag.ItemIsDragEnabled | Qt.ItemFlag.ItemIsDropEnabled)
+        unc_item.setText(0, self.UNCATEGORIZED_NAME); unc_item.setToolTip(0, self.UNCATEGORIZED_NAME)
+        return unc_item
+
+    def _ensure_uncategorized_item(self):
+        """Return the 'Uncategorized' top-level item, creating it if absent."""
+        unc_item = self._find_category_item(self.UNCATEGORIZED_NAME)
+        if unc_item is None:
+            unc_item = self._build_uncategorized_item()
+            self.tree_widget.addTopLevelItem(unc_item)
+            unc_item.setExpanded(self.prompts_data.get("uncategorized_expanded", True))
+        return unc_item
+
+    def _find_category_item(self, category_name):
+        for i in range(self.tree_widget.topLevelItemCount()):
+            item = self.tree_widget.topLevelItem(i)
+            if item.data(0, Qt.ItemDataRole.UserRole)["name"] == category_name: return item
+        return None
+
+    def _find_prompt_item(self, category_name, prompt_name):
+        cat_item = self._find_category_item(category_name)
+        if cat_item is None: return None
+        for i in range(cat_item.childCount()):
+            child = cat_item.child(i)
+            if child.data(0, Qt.ItemDataRole.UserRole)["name"] == prompt_name: return child
+        return None
+
+    def _remove_prompt_item(self, category_name, prompt_name):
+        cat_item = self._find_category_item(category_name)
+        if cat_item is None: return
+        for i in range(cat_item.childCount()):
+            if cat_item.child(i).data(0, Qt.ItemDataRole.UserRole)["name"] == prompt_name:
+                cat_item.takeChild(i); break
+        # The Uncategorized header is only shown while it has prompts.
+        if category_name == self.UNCATEGORIZED_NAME and cat_item.childCount() == 0:
+            self.tree_widget.takeTopLevelItem(self.tree_widget.indexOfTopLevelItem(cat_item))
+
+    def _rebuild_index(self):
+        """Recompute the lookup tables after wholesale prompts_data changes."""
+        self._cat_index = {c["name"]: c for c in self.prompts_data.get("categories", [])}
+        self._prompt_index = {}
+        for cat in self.prompts_data.get("categories", []):
+            for p in cat.get("prompts", []): self._prompt_index[(cat["name"], p["name"])] = p
+        for p in self.prompts_data.get("uncategorized", []):
+            self._prompt_index[(self.UNCATEGORIZED_NAME, p["name"])] = p
+
+    def _count_visible_rows(self):
+        """Visible row count derived from the data model, avoiding a Qt item walk."""
+        rows = 0
+        for cat in self.prompts_data.get("categories", []):
+            rows += 1
+            if cat.get("expanded", True): rows += len(cat.get("prompts", []))
+        uncategorized = self.prompts_data.get("uncategorized", [])
+        if uncategorized:
+            rows += 1
+            if self.prompts_data.get("uncategorized_expanded", True): rows += len(uncategorized)
+        return rows
 
     def get_category_names(self):
         return [self.UNCATEGORIZED_NAME] + [c["name"] for c in self.prompts_data.get("categories", [])]
 
     def find_prompt_list(self, category_name):
         if category_name == self.UNCATEGORIZED_NAME: return self.prompts_data.get("uncategorized", [])
-        return next((c.get("prompts", []) for c in self.prompts_data.get("categories", []) if c["name"] == category_name), None)
+        cat = self._cat_index.get(category_name)
+        return cat.get("prompts", []) if cat is not None else None
 
     def on_item_expansion_changed(self, item, expanded):
         data = item.data(0, Qt.ItemDataRole.UserRole)
         if data and data["is_category"]:
             if data["name"] == self.UNCATEGORIZED_NAME: self.prompts_data["uncategorized_expanded"] = expanded
             else:
-                for category in self.prompts_data.get("categories", []):
-                    if category["name"] == data["name"]: category["expanded"] = expanded; break
+                cat = self._cat_index.get(data["name"])
+                if cat is not None: cat["expanded"] = expanded
             self.save_prompts()
 
+    def _get_dialog(self, **kwargs):
+        # Building the dialog's widget tree is the slow part, so keep one
+        # instance around and just repopulate it per use.
+        if self._dialog is None:
+            self._dialog = PromptDialog(self, **kwargs)
+        else:
+            self._dialog.reset(**kwargs)
+        return self._dialog
+
     def add_prompt(self):
-        dialog = PromptDialog(self, categories=self.get_category_names())
+        dialog = self._get_dialog(categories=self.get_category_names())
         if dialog.exec():
             name, content, category_name = dialog.get_data()
             if not (name and content): return QMessageBox.warning(self, "Input Error", "Name and content cannot be empty.")
             new_prompt = {"name": name, "content": content}
             prompt_list = self.find_prompt_list(category_name)
-            if prompt_list is not None: prompt_list.append(new_prompt)
-            self.save_prompts(); self.refresh_list()
+            if prompt_list is not None:
+                prompt_list.append(new_prompt)
+                self._prompt_index[(category_name, name)] = new_prompt
+                parent_item = self._ensure_uncategorized_item() if category_name == self.UNCATEGORIZED_NAME else self._find_category_item(category_name)
+                if parent_item is not None: self.create_prompt_item(new_prompt, category_name, parent_item)
+            self.save_prompts()
 
     def add_category(self):
         text, ok = QInputDialog.getText(self, "New Category", "Enter new category name:")
         if ok and text:
             if text in self.get_category_names(): return QMessageBox.warning(self, "Error", "A category with this name already exists.")
-            self.prompts_data.setdefault("categories", []).append({"name": text, "prompts": [], "expanded": True})
-            self.save_prompts(); self.refresh_list()
+            new_category = {"name": text, "prompts": [], "expanded": True}
+            categories = self.prompts_data.setdefault("categories", [])
+            categories.append(new_category)
+            self._cat_index[text] = new_category
+            # Insert before the trailing Uncategorized item (if shown).
+            self.create_category_item(new_category, index=len(categories) - 1)
+            self.save_prompts()
+
+    def _set_item_label(self, item, text):
+        item.setText(0, text); item.setToolTip(0, text)
 
     def edit_item(self, item_data):
         if item_data["is_category"]:
             old_name, new_name, ok = item_data["name"], *QInputDialog.getText(self, "Edit Category", "Enter new name:", text=item_data["name"])
             if ok and new_name and new_name != old_name:
                 if new_name in self.get_category_names(): return QMessageBox.warning(self, "Error", "Category name exists.")
-                for cat in self.prompts_data["categories"]:
-                    if cat["name"] == old_name: cat["name"] = new_name; break
-                self.save_prompts(); self.refresh_list()
+                cat = self._cat_index.pop(old_name, None)
+                if cat is not None:
+                    cat["name"] = new_name
+                    self._cat_index[new_name] = cat
+                    for p in cat.get("prompts", []):
+                        self._prompt_index[(new_name, p["name"])] = self._prompt_index.pop((old_name, p["name"]), p)
+                cat_item = self._find_category_item(old_name)
+                if cat_item is not None:
+                    # data() hands back a copy (dicts round-trip through
+                    # QVariant), so write the updated dict back with setData.
+                    cat_item.setData(0, Qt.ItemDataRole.UserRole, {"name": new_name, "is_category": True})
+                    for i in range(cat_item.childCount()):
+                        child = cat_item.child(i)
+                        child_data = child.data(0, Qt.ItemDataRole.UserRole)
+                        child_data["category"] = new_name
+                        child.setData(0, Qt.ItemDataRole.UserRole, child_data)
+                    self._set_item_label(cat_item, new_name)
+                self.save_prompts()
         else:
             p_name, c_name = item_data["name"], item_data["category"]
             p_list = self.find_prompt_list(c_name)
-            prompt = next((p for p in p_list if p["name"] == p_name), None) if p_list is not None else None
-            if not prompt: return
-            dialog = PromptDialog(self, name=p_name, content=prompt["content"], categories=self.get_category_names(), current_category=c_name)
+            prompt = self._prompt_index.get((c_name, p_name))
+            if not prompt or p_list is None: return
+            dialog = self._get_dialog(name=p_name, content=prompt["content"], categories=self.get_category_names(), current_category=c_name)
             if dialog.exec():
                 new_n, new_c, new_cat_n = dialog.get_data()
                 if not (new_n and new_c): return QMessageBox.warning(self, "Input Error", "Fields cannot be empty.")
-                p_list.remove(prompt)
-                upd_prompt = {"name": new_n, "content": new_c}
-                new_p_list = self.find_prompt_list(new_cat_n)
-                if new_p_list is not None: new_p_list.append(upd_prompt)
-                self.save_prompts(); self.refresh_list()
+                prompt["name"], prompt["content"] = new_n, new_c
+                self._prompt_index.pop((c_name, p_name), None)
+                self._prompt_index[(new_cat_n, new_n)] = prompt
+                if new_cat_n == c_name:
+                    item = self._find_prompt_item(c_name, p_name)
+                    if item is not None:
+                        item_d = item.data(0, Qt.ItemDataRole.UserRole)
+                        item_d["name"] = new_n
+                        item.setData(0, Qt.ItemDataRole.UserRole, item_d)
+                        self._set_item_label(item, new_n)
+                else:
+                    p_list.remove(prompt)
+                    new_p_list = self.find_prompt_list(new_cat_n)
+                    if new_p_list is not None: new_p_list.append(prompt)
+                    self._remove_prompt_item(c_name, p_name)
+                    parent_item = self._ensure_uncategorized_item() if new_cat_n == self.UNCATEGORIZED_NAME else self._find_category_item(new_cat_n)
+                    if parent_item is not None: self.create_prompt_item(prompt, new_cat_n, parent_item)
+                self.save_prompts()
 
     def delete_item(self, item_data):
         name = item_data["name"]
         if item_data["is_category"]:
             if name == self.UNCATEGORIZED_NAME: return
             if QMessageBox.question(self, "Confirm", f"Delete '{name}'?\nPrompts will move to Uncategorized.") == QMessageBox.StandardButton.Yes:
-                cat = next((c for c in self.prompts_data["categories"] if c["name"] == name), None)
+                cat = self._cat_index.get(name)
                 if cat:
                     self.prompts_data.setdefault("uncategorized", []).extend(cat["prompts"])
                     self.prompts_data["categories"].remove(cat)
-                    self.save_prompts(); self.refresh_list()
+                    del self._cat_index[name]
+                    for p in cat["prompts"]:
+                        self._prompt_index[(self.UNCATEGORIZED_NAME, p["name"])] = self._prompt_index.pop((name, p["name"]), p)
+                    cat_item = self._find_category_item(name)
+                    unc_item = self._ensure_uncategorized_item() if cat["prompts"] else None
+                    if unc_item is not None:
+                        for prompt in cat["prompts"]: self.create_prompt_item(prompt, self.UNCATEGORIZED_NAME, unc_item)
+                    if cat_item is not None:
+                        self.tree_widget.takeTopLevelItem(self.tree_widget.indexOfTopLevelItem(cat_item))
+                    self.save_prompts()
         else:
             if QMessageBox.question(self, "Confirm", f"Delete prompt '{name}'?") == QMessageBox.StandardButton.Yes:
                 p_list = self.find_prompt_list(item_data["category"])
-                prompt = next((p for p in p_list if p["name"] == name), None) if p_list is not None else None
-                if prompt: p_list.remove(prompt); self.save_prompts(); self.refresh_list()
+                prompt = self._prompt_index.get((item_data["category"], name))
+                if prompt and p_list is not None:
+                    p_list.remove(prompt)
+                    self._prompt_index.pop((item_data["category"], name), None)
+                    self._remove_prompt_item(item_data["category"], name)
+                    self.save_prompts()
     
     def handle_prompt_move(self, prompt_name, old_c_name, new_c_name):
         old_p_list = self.find_prompt_list(old_c_name)
-        prompt = next((p for p in old_p_list if p["name"] == prompt_name), None) if old_p_list is not None else None
-        if prompt:
+        prompt = self._prompt_index.get((old_c_name, prompt_name))
+        if prompt and old_p_list is not None:
             old_p_list.remove(prompt)
             new_p_list = self.find_prompt_list(new_c_name)
             if new_p_list is not None: new_p_list.append(prompt)
-            self.save_prompts(); self.refresh_list()
-    
+            self._prompt_index[(new_c_name, prompt_name)] = self._prompt_index.pop((old_c_name, prompt_name))
+            self._remove_prompt_item(old_c_name, prompt_name)
+            parent_item = self._ensure_uncategorized_item() if new_c_name == self.UNCATEGORIZED_NAME else self._find_category_item(new_c_name)
+            if parent_item is not None: self.create_prompt_item(prompt, new_c_name, parent_item)
+            self.save_prompts()
+
     def handle_prompt_reorder(self, category_name, dragged_prompt_name, target_prompt_name):
         prompt_list = self.find_prompt_list(category_name)
         if prompt_list is None: return
-        dragged_idx = next((i for i, p in enumerate(prompt_list) if p["name"] == dragged_prompt_name), -1)
-        target_idx = next((i for i, p in enumerate(prompt_list) if p["name"] == target_prompt_name), -1)
-        if dragged_idx != -1 and target_idx != -1:
-            moved_item = prompt_list.pop(dragged_idx)
-            prompt_list.insert(target_idx, moved_item)
-            self.save_prompts(); self.refresh_list()
+        # One pass to materialize the names, then two C-level index() calls.
+        names = [p["name"] for p in prompt_list]
+        try:
+            dragged_idx, target_idx = names.index(dragged_prompt_name), names.index(target_prompt_name)
+        except ValueError:
+            return
+        moved_item = prompt_list.pop(dragged_idx)
+        prompt_list.insert(target_idx, moved_item)
+        # Tree child order mirrors the list, so move just the one item.
+        cat_item = self._find_category_item(category_name)
+        if cat_item is not None:
+            self.tree_widget.setUpdatesEnabled(False)
+            try:
+                item = cat_item.takeChild(dragged_idx)
+                cat_item.insertChild(target_idx, item)
+            finally:
+                self.tree_widget.setUpdatesEnabled(True)
+        self.save_prompts()
 
     def handle_category_reorder(self, dragged_name, target_name):
         cats = self.prompts_data["categories"]
-        drag_idx = next((i for i, c in enumerate(cats) if c["name"] == dragged_name), -1)
-        target_idx = next((i for i, c in enumerate(cats) if c["name"] == target_name), -1)
-        if drag_idx != -1 and target_idx != -1:
-            cats.insert(target_idx, cats.pop(drag_idx))
-            self.save_prompts(); self.refresh_list()
+        names = [c["name"] for c in cats]
+        try:
+            drag_idx, target_idx = names.index(dragged_name), names.index(target_name)
+        except ValueError:
+            return
+        moved_cat = cats.pop(drag_idx)
+        cats.insert(target_idx, moved_cat)
+        # Categories occupy the leading top-level slots, so the data
+        # indices are also the tree indices.
+        self.tree_widget.setUpdatesEnabled(False)
+        try:
+            item = self.tree_widget.takeTopLevelItem(drag_idx)
+            self.tree_widget.insertTopLevelItem(target_idx, item)
+            item.setExpanded(moved_cat.get("expanded", True))
+        finally:
+            self.tree_widget.setUpdatesEnabled(True)
+        self.save_prompts()
 
     def item_selected(self, item, col):
         data = item.data(0, Qt.ItemDataRole.UserRole)
         if data and not data["is_category"]:
-            p_list = self.find_prompt_list(data["category"])
-            p = next((p for p in p_list if p["name"] == data["name"]), None) if p_list is not None else None
+            p = self._prompt_index.get((data["category"], data["name"]))
             if p: self.hide(); self.app.inject_text(p["content"])
-            
-    def keyPressEvent(self, event):
-        if event.key() == Qt.Key.Key_Escape: self.hide()
-        elif event.key() in (Qt.Key.Key_Return, Qt.Key.Key_Enter):
-            if self.tree_widget.currentItem(): self.item_selected(self.tree_widget.currentItem(), 0)
+
+    def _activate_current(self):
+        item = self.tree_widget.currentItem()
+        if item is not None: self.item_selected(item, 0)
 
 # --- Application Core ---
+class _PasteSignals(QObject):
+    """Carries errors from the paste worker back to the GUI thread."""
+    __slots__ = ()
+
+    error = pyqtSignal(str)
+
+class _PasteTask(QRunnable):
+    """Runs the clipboard-copy and paste-keystroke subprocesses off the GUI thread."""
+    __slots__ = ("text", "copy_cmd", "paste_cmd", "signals")
+
+    def __init__(self, text, copy_cmd, paste_cmd, signals):
+        super().__init__()
+        self.text = text
+        self.copy_cmd = copy_cmd; self.paste_cmd = paste_cmd
+        self.signals = signals
+
+    def run(self):
+        # Imported on first paste rather than at startup; like pynput in
+        # run(), the module is only needed once the user actually pastes.
+        import subprocess
+        try:
+            # A long-lived clipboard process isn't an option: wl-copy and xclip
+            # both read stdin to EOF before serving the selection, so each paste
+            # needs fresh spawns. close_fds=False at least skips the fd-table
+            # scan that subprocess otherwise performs between fork and exec.
+            subprocess.run(self.copy_cmd, text=True, check=True, input=self.text, close_fds=False)
+            subprocess.run(self.paste_cmd, check=True, close_fds=False)
+            print(f"✅ Pasted: '{self.text[:30].strip()}...'")
+        except FileNotFoundError as e:
+            self.signals.error.emit(f"Missing tool: {e.filename}. Is it installed?")
+        except Exception as e:
+            self.signals.error.emit(f"Pasting error: {e}")
+
+class _KeySynthTask(QRunnable):
+    """X11 fast path: the clipboard is already set through Qt, so only the
+    Ctrl+V keystroke needs synthesizing — no subprocess spawns at all. Any
+    failure falls back to the external-tool pair."""
+    __slots__ = ("text", "controller", "ctrl_key", "copy_cmd", "paste_cmd", "signals")
+
+    def __init__(self, text, controller, ctrl_key, copy_cmd, paste_cmd, signals):
+        super().__init__()
+        self.text = text
+        self.controller = controller; self.ctrl_key = ctrl_key
+        self.copy_cmd = copy_cmd; self.paste_cmd = paste_cmd
+        self.signals = signals
+
+    def run(self):
+        try:
+            with self.controller.pressed(self.ctrl_key):
+                self.controller.press('v'); self.controller.release('v')
+            print(f"✅ Pasted: '{self.text[:30].strip()}...'")
+        except Exception:
+            _PasteTask(self.text, self.copy_cmd, self.paste_cmd, self.signals).run()
+
 class ShiftPrompterApp(QObject):
+    __slots__ = ("_is_wayland", "_copy_bin", "_paste_bin", "_copy_cmd", "_paste_cmd",
+                 "_paste_signals", "_keyboard", "_kbd_controller",
+                 "_screen_geometry", "prompt_window")
+
     toggle_window_signal = pyqtSignal()
 
     def __init__(self):
         super().__init__()
-        self.last_shift_press_time = 0
+        # Resolve the session type and clipboard/paste tool paths once so each
+        # paste skips the env lookup and PATH scan.
+        self._is_wayland = os.getenv("XDG_SESSION_TYPE", "").lower() == "wayland"
+        copy_tool, paste_tool = ("wl-copy", "wtype") if self._is_wayland else ("xclip", "xdotool")
+        # Keep the bare name when the tool is missing so the existing
+        # FileNotFoundError dialog still reports which one it was.
+        self._copy_bin = shutil.which(copy_tool) or copy_tool
+        self._paste_bin = shutil.which(paste_tool) or paste_tool
+        # The argv sequences are constants after the session-type decision,
+        # so freeze them once instead of rebuilding lists on every paste.
+        if self._is_wayland:
+            self._copy_cmd = (self._copy_bin,)
+            self._paste_cmd = (self._paste_bin, "-M", "shift", "-P", "insert", "-m", "shift")
+        else:
+            self._copy_cmd = (self._copy_bin, "-selection", "clipboard")
+            self._paste_cmd = (self._paste_bin, "key", "--clearmodifiers", "ctrl+v")
+        self._paste_signals = _PasteSignals()
+        self._paste_signals.error.connect(self._on_paste_error)
+        # Set up in run() once pynput is imported; used for the X11 fast paste path.
+        self._keyboard = None
+        self._kbd_controller = None
+        # Screen geometry queries can mean a display-server round-trip, so keep
+        # a per-screen cache invalidated by Qt's screen signals instead of
+        # asking on every window placement.
+        self._screen_geometry = {}
+        gui_app = QGuiApplication.instance()
+        for screen in gui_app.screens(): self._watch_screen(screen)
+        gui_app.screenAdded.connect(self._watch_screen)
+        gui_app.screenRemoved.connect(self._forget_screen)
         self.prompt_window = PromptWindow(self)
         self.toggle_window_signal.connect(self.toggle_window)
         signal.signal(signal.SIGINT, self.handle_exit); signal.signal(signal.SIGTERM, self.handle_exit)
 
+    def _watch_screen(self, screen):
+        self._screen_geometry[screen] = screen.availableGeometry()
+        screen.availableGeometryChanged.connect(
+            lambda rect, s=screen: self._screen_geometry.__setitem__(s, rect))
+
+    def _forget_screen(self, screen):
+        self._screen_geometry.pop(screen, None)
+
+    def _screen_rect(self, screen):
+        rect = self._screen_geometry.get(screen)
+        return rect if rect is not None else screen.availableGeometry()
+
     def handle_exit(self, *args):
         print("\nClosing Shift-Prompter..."); QApplication.instance().quit()
 
-    def on_shift_press(self, key):
-        if key in {keyboard.Key.shift, keyboard.Key.shift_l, keyboard.Key.shift_r}:
-            current_time = time.monotonic()
-            if (current_time - self.last_shift_press_time) < DOUBLE_TAP_THRESHOLD_S: self.toggle_window_signal.emit()
-            self.last_shift_press_time = current_time
+    def _make_on_press(self, keyboard):
+        """Build the listener callback as a closure with every name it touches
+        bound locally, so the per-keystroke hot path does no attribute lookups."""
+        shifts = frozenset((keyboard.Key.shift, keyboard.Key.shift_l, keyboard.Key.shift_r))
+        state = [0, 0]  # [last press time ns, last emit time ns]
+
+        def on_press(key, _shifts=shifts, _emit=self.toggle_window_signal.emit,
+                     _monotonic=time.monotonic_ns,
+                     _min=_DOUBLE_TAP_MIN_NS, _max=_DOUBLE_TAP_MAX_NS,
+                     _throttle=_TOGGLE_THROTTLE_NS, _state=state):
+            # Runs on the pynput listener thread for every key press system-wide,
+            # so reject non-shift keys with a single membership test up front.
+            if key not in _shifts: return
+            now = _monotonic()
+            time_diff = now - _state[0]
+            _state[0] = now
+            # Only taps inside the (min, max) zone count: anything quicker is
+            # switch bounce or auto-repeat, and emits are throttled so held
+            # shifts can't queue up a burst of toggles.
+            if _min < time_diff < _max and (now - _state[1]) >= _throttle:
+                _state[1] = now
+                _emit()
+
+        return on_press
 
     def toggle_window(self):
         if self.prompt_window.isVisible(): self.prompt_window.hide()
         else:
-            self.prompt_window.refresh_list()
-            iterator = QTreeWidgetItemIterator(self.prompt_window.tree_widget)
-            visible_rows, row_height = 0, self.prompt_window.tree_widget.sizeHintForRow(0)
-            if row_height <= 0: row_height = 28
-            while iterator.value():
-                if not iterator.value().isHidden(): visible_rows += 1
-                iterator += 1
-            
-            margins = self.prompt_window.main_layout.contentsMargins()
-            buttons_height = self.prompt_window.button_layout.sizeHint().height()
-            spacing = self.prompt_window.main_layout.spacing()
-            total_height = (row_height * visible_rows) + buttons_height + margins.top() + margins.bottom() + spacing + 5
+            self.prompt_window.maybe_reload()
+            # The height only changes when the prompt data does, so reuse the
+            # cached value and skip the full item walk on unchanged opens.
+            if self.prompt_window._size_dirty:
+                if self.prompt_window._row_height is None:
+                    row_height = self.prompt_window.tree_widget.sizeHintForRow(0)
+                    self.prompt_window._row_height = row_height if row_height > 0 else 28
+                if self.prompt_window._chrome_height is None:
+                    # Margins, button row, and spacing never change after init_ui.
+                    margins = self.prompt_window.main_layout.contentsMargins()
+                    self.prompt_window._chrome_height = (self.prompt_window.button_layout.sizeHint().height()
+                                                         + margins.top() + margins.bottom()
+                                                         + self.prompt_window.main_layout.spacing() + 5)
+                total_height = (self.prompt_window._row_height * self.prompt_window._count_visible_rows()
+                                + self.prompt_window._chrome_height)
 
-            max_height = int(QGuiApplication.primaryScreen().availableGeometry().height() * 0.6)
-            self.prompt_window.resize(self.prompt_window.width(), min(total_height, max_height))
+                max_height = int(self._screen_rect(QGuiApplication.primaryScreen()).height() * 0.6)
+                self.prompt_window._cached_height = min(total_height, max_height)
+                self.prompt_window._size_dirty = False
+            self.prompt_window.resize(self.prompt_window.width(), self.prompt_window._cached_height)
             self.position_window_near_cursor()
             self.prompt_window.show()
             self.prompt_window.activateWindow(); self.prompt_window.raise_()
             self.prompt_window.tree_widget.setFocus()
 
     def position_window_near_cursor(self):
-        screen_rect = (QGuiApplication.screenAt(QCursor.pos()) or QGuiApplication.primaryScreen()).availableGeometry()
+        screen_rect = self._screen_rect(QGuiApplication.screenAt(QCursor.pos()) or QGuiApplication.primaryScreen())
         cursor_pos, win_size, margin = QCursor.pos(), self.prompt_window.size(), 10
         x = max(screen_rect.left() + margin, min(cursor_pos.x(), screen_rect.right() - win_size.width() - margin))
         y = max(screen_rect.top() + margin, min(cursor_pos.y(), screen_rect.bottom() - win_size.height() - margin))
         self.prompt_window.move(x, y)
 
     def inject_text(self, text: str):
-        try:
-            if os.getenv('XDG_SESSION_TYPE', '').lower() == 'wayland':
-                subprocess.run(['wl-copy'], text=True, check=True, input=text)
-                subprocess.run(['wtype', '-M', 'shift', '-P', 'insert', '-m', 'shift'], check=True)
-            else:
-                subprocess.run(['xclip', '-selection', 'clipboard'], text=True, check=True, input=text)
-                subprocess.run(['xdotool', 'key', '--clearmodifiers', 'ctrl+v'], check=True)
-            print(f"✅ Pasted: '{text[:30].strip()}...'")
-        except FileNotFoundError as e:
-            msg = f"Missing tool: {e.filename}. Is it installed?"
-            QMessageBox.critical(None, "Error", msg); print(f"❌ {msg}")
-        except Exception as e:
-            msg = f"Pasting error: {e}"
-            QMessageBox.critical(None, "Error", msg); print(f"❌ {msg}")
+        # On X11 the clipboard can be filled through Qt (a window-system call,
+        # not a process spawn) and the paste keystroke synthesized by pynput,
+        # eliminating both fork/execs. Wayland keeps the wl-copy/wtype pair:
+        # a hidden window can't reliably own the Wayland clipboard.
+        if not self._is_wayland and self._kbd_controller is not None:
+            QGuiApplication.clipboard().setText(text)
+            QThreadPool.globalInstance().start(
+                _KeySynthTask(text, self._kbd_controller, self._keyboard.Key.ctrl,
+                              self._copy_cmd, self._paste_cmd, self._paste_signals))
+            return
+        # Hand the subprocess work to the pool so the event loop (and the
+        # hide -> focus-return sequence) isn't blocked on two process spawns.
+        QThreadPool.globalInstance().start(
+            _PasteTask(text, self._copy_cmd, self._paste_cmd, self._paste_signals))
+
+    def _on_paste_error(self, msg):
+        QMessageBox.critical(None, "Error", msg); print(f"❌ {msg}")
 
     def run(self):
+        # Deferred from module scope: the pynput backend import is a sizeable
+        # slice of cold start and isn't needed until the listener is armed.
+        from pynput import keyboard
+        self._keyboard = keyboard
+        if not self._is_wayland:
+            self._kbd_controller = keyboard.Controller()
         print("🚀 Shift-Prompter is active. (Press Ctrl+C to exit)")
-        listener = keyboard.Listener(on_press=self.on_shift_press); listener.start()
+        # A per-key listener is deliberate: pynput's GlobalHotKeys can't express
+        # a double-tap of a bare modifier, and X11 key grabs (XGrabKey) have no
+        # Wayland equivalent, so filtering shift presses in the callback is
+        # the portable option. The callback is kept to a few identity checks.
+        listener = keyboard.Listener(on_press=self._make_on_press(keyboard)); listener.start()
         app = QApplication.instance()
         app.aboutToQuit.connect(listener.stop)
         self.prompt_window.hide(); sys.exit(app.exec())